@@ -7,6 +7,7 @@ let autoRefreshHandle: number | undefined;
 const AUTO_REFRESH_MS = 1_000; // 1 second
 let machineSettings: MachineSettings | undefined;
 let currentMachineSlug: string | undefined;
+let passesVersion: string | undefined;
 const expandedPasses = new Set<string>();
 const expandedEntries = new Set<string>();
 
@@ -36,6 +37,12 @@ interface PassInfo {
 
 interface PassesData {
   passes: Record<string, PassInfo>;
+  version?: string;
+}
+
+interface PassesUnchanged {
+  version: string;
+  unchanged: true;
 }
 
 interface ArchiveStartResponse {
@@ -44,6 +51,7 @@ interface ArchiveStartResponse {
   size: number;
   timestamp?: string;
   machine?: string;
+  suggested_chunk_size?: number;
 }
 
 interface ArchiveChunkResponse {
@@ -120,14 +128,22 @@ async function refreshPasses() {
   }
 
   try {
-    const request = VIAM.Struct.fromJson({ command: "list_passes" });
+    const request = VIAM.Struct.fromJson(
+      passesVersion
+        ? { command: "list_passes", since: passesVersion }
+        : { command: "list_passes" }
+    );
     const raw = (await webappService.doCommand(request)) as unknown;
-    if (!isPassesData(raw)) {
-      throw new Error("Unexpected response shape from list_passes");
+    if (!isPassesUnchanged(raw)) {
+      if (!isPassesData(raw)) {
+        throw new Error("Unexpected response shape from list_passes");
+      }
+      displayPasses(raw.passes);
+      passesVersion = raw.version;
     }
-    displayPasses(raw.passes);
     setStatus(`Connected · Last updated ${new Date().toLocaleTimeString()}`);
   } catch (error) {
+    passesVersion = undefined;
     console.error("Error loading passes:", error);
     showError(`Error loading passes: ${String(error)}`);
   }
@@ -291,15 +307,19 @@ async function downloadFile(passId: string, filename: string) {
     const fileResponse = result as {
       filename?: string;
       data?: string;
+      text?: string;
       size?: number;
     };
 
-    const base64Data = fileResponse.data;
-    if (typeof base64Data !== "string") {
+    let blob: Blob;
+    if (typeof fileResponse.text === "string") {
+      blob = new Blob([fileResponse.text], { type: "application/octet-stream" });
+    } else if (typeof fileResponse.data === "string") {
+      blob = base64ToBlob(fileResponse.data);
+    } else {
       throw new Error("Service response missing file data");
     }
 
-    const blob = base64ToBlob(base64Data);
     const url = URL.createObjectURL(blob);
     const anchor = document.createElement("a");
     anchor.href = url;
@@ -355,7 +375,7 @@ async function downloadPass(passId: string, evt?: Event) {
     const totalSize = startRaw.size;
     const filename = startRaw.filename || `${passId}.zip`;
 
-    const chunkSize = 4 * 1024 * 1024;
+    const chunkSize = startRaw.suggested_chunk_size ?? 4 * 1024 * 1024;
     const parts: ArrayBuffer[] = [];
     let nextOffset = 0;
     let downloadedBytes = 0;
@@ -792,6 +812,14 @@ function isPassesData(value: unknown): value is PassesData {
   return Object.values(passesRecord).every(isPassInfo);
 }
 
+function isPassesUnchanged(value: unknown): value is PassesUnchanged {
+  if (!value || typeof value !== "object") {
+    return false;
+  }
+  const record = value as Record<string, unknown>;
+  return record.unchanged === true && typeof record.version === "string";
+}
+
 function isArchiveStartResponse(value: unknown): value is ArchiveStartResponse {
   if (!value || typeof value !== "object") {
     return false;
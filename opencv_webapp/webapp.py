@@ -4,16 +4,21 @@ Minimal Viam Generic Service for Calibration File Management.
 
 from __future__ import annotations
 
-import base64
 import contextlib
+import functools
 import logging
+import os
 import re
 import tempfile
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Mapping, MutableMapping, Sequence, Tuple
+from typing import Any, Iterator, Mapping, Sequence, Tuple
 from uuid import uuid4
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
 
 import asyncio
 
@@ -26,16 +31,52 @@ from viam.resource.types import Model, ModelFamily
 from viam.services.generic import Generic
 from viam.utils import struct_to_dict
 
+try:  # SIMD-accelerated codec; falls back to the stdlib when unavailable.
+    import pybase64 as _base64
+except ImportError:  # pragma: no cover - depends on the build environment
+    import base64 as _base64
+
 logger = logging.getLogger(__name__)
 
+_TS_RE_COMPACT = re.compile(r"(\d{4})(\d{2})(\d{2})-(\d{2})(\d{2})(\d{2})")
+_TS_RE_DASHED = re.compile(r"(\d{4})-(\d{2})-(\d{2})-(\d{2})-(\d{2})-(\d{2})")
+_TS_RE_EPOCH = re.compile(r"(\d{10})")
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_timestamp(pass_id: str) -> str:
+    """Parse the capture time embedded in ``pass_id``, or return "Unknown"."""
+    match = _TS_RE_COMPACT.search(pass_id)
+    if match:
+        return "%s-%s-%s %s:%s:%s" % match.groups()
+
+    match = _TS_RE_DASHED.search(pass_id)
+    if match:
+        return "%s-%s-%s %s:%s:%s" % match.groups()
+
+    match = _TS_RE_EPOCH.search(pass_id)
+    if match:
+        try:
+            timestamp = int(match.group(1))
+            return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            pass
+
+    return "Unknown"
+
 
 class WebApp(Generic, EasyResource):
     """Expose calibration files through the Generic do_command API.
 
     Supported commands:
-      - {"command": "list_passes"}
+      - {"command": "list_passes", "since": "<version>"}
+        (replies carry a "version"; passing it back as "since" returns
+        {"unchanged": true} instead of the full listing when nothing changed)
       - {"command": "get_file", "pass_id": "...", "filename": "..."}
+        (small UTF-8 files come back as "text", everything else as base64 "data")
+      - {"command": "get_files", "pass_id": "...", "filenames": ["...", "..."]}
       - {"command": "start_pass_archive", "pass_id": "..."}
+        (the reply includes a "suggested_chunk_size" for the chunk requests)
       - {"command": "get_pass_archive_chunk", "session": "...", "offset": 0, "chunk_size": 4194304}
       - {"command": "finish_pass_archive", "session": "..."}
       - {"command": "get_base_dir"}
@@ -43,12 +84,47 @@ class WebApp(Generic, EasyResource):
 
     MODEL = Model(ModelFamily("viam", "opencv-webapp"), "webapp")
 
+    # Deflating these gains next to nothing, so they are stored as-is.
+    _STORED_SUFFIXES = frozenset(
+        {".png", ".jpg", ".jpeg", ".mp4", ".zip", ".zst", ".gz"}
+    )
+    # Members up to this size are compressed in parallel and held in memory;
+    # larger ones are streamed straight into the archive.
+    _PARALLEL_MAX_BYTES = 4 * 1024 * 1024
+    _COMPRESS_WORKERS = min(4, os.cpu_count() or 1)
+    # Archives of completed passes are kept for reuse up to this many bytes in
+    # total; the least recently used ones are deleted first.
+    _ARCHIVE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    # get_file returns UTF-8 files up to this size as plain "text".
+    _TEXT_MAX_BYTES = 256 * 1024
+    # get_files refuses requests whose files add up to more than this.
+    _FILES_MAX_BYTES = 16 * 1024 * 1024
+
+    # Archive sessions a client abandons are closed after this many idle
+    # seconds; past _MAX_SESSIONS the least recently used one is closed.
+    _SESSION_TTL = 30 * 60
+    _SESSION_REAP_INTERVAL = 60
+    _MAX_SESSIONS = 32
+
     def __init__(self, name: str, base_dir: str = "./module-data/calibration-passes"):
         super().__init__(name)
         self.base_dir = Path(base_dir).expanduser().resolve()
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        # base_dir with a trailing separator, for prefix containment checks.
+        self._base_prefix = os.path.join(str(self.base_dir), "")
         logger.info("WebApp service '%s' initialized at %s", self.name, self.base_dir)
-        self._archive_sessions: MutableMapping[str, dict[str, Any]] = {}
+        # Ordered least- to most-recently used, for LRU eviction.
+        self._archive_sessions: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._session_reaper: asyncio.Task[None] | None = None
+        self._list_cache: dict[str, tuple[int, dict[str, Any]]] = {}
+        self._listing: dict[str, Any] | None = None
+        self._listing_version = uuid4().hex
+        # pass_dir -> (archive_path, size, (dir mtime, .complete mtime)),
+        # ordered least- to most-recently used.
+        self._archive_cache: OrderedDict[
+            Path, tuple[Path, int, tuple[int, int]]
+        ] = OrderedDict()
+        self._closed = False
 
     @classmethod
     def new(
@@ -78,9 +154,34 @@ class WebApp(Generic, EasyResource):
         if new_dir != self.base_dir:
             self.base_dir = new_dir
             self.base_dir.mkdir(parents=True, exist_ok=True)
+            self._base_prefix = os.path.join(str(self.base_dir), "")
+            # Cached listings and archives describe the old directory; any
+            # other attribute change leaves them valid.
+            self._list_cache.clear()
+            self._clear_archive_cache()
             logger.info("Reconfigured to watch %s", self.base_dir)
         return super().reconfigure(config, dependencies)
 
+    async def close(self):
+        self._closed = True
+        reaper, self._session_reaper = self._session_reaper, None
+        if reaper is not None:
+            # Wait for the cancellation to land so the task is not left
+            # pending when the module's event loop shuts down.
+            reaper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reaper
+        for session_id in list(self._archive_sessions):
+            self._finish_pass_archive(session_id)
+        self._clear_archive_cache()
+        await super().close()
+
+    def _clear_archive_cache(self) -> None:
+        cached_paths = [cached[0] for cached in self._archive_cache.values()]
+        self._archive_cache.clear()
+        for archive_path in cached_paths:
+            self._release_archive(archive_path)
+
     async def do_command(
         self,
         command: Mapping[str, Any],
@@ -89,22 +190,28 @@ class WebApp(Generic, EasyResource):
         **kwargs: Any,
     ) -> Mapping[str, Any]:
         cmd = command.get("command")
-        logger.info("do_command received: %s", command)
+        # Only the command name: the full payload can carry file data, and
+        # list_passes / chunk requests arrive several times a second.
+        logger.debug("do_command received: %s", cmd)
         if cmd == "list_passes":
-            return self._list_passes()
+            return self._list_passes(command.get("since"))
         if cmd == "get_file":
             pass_id = command.get("pass_id")
             filename = command.get("filename")
             return self._get_file(pass_id, filename)
+        if cmd == "get_files":
+            pass_id = command.get("pass_id")
+            filenames = command.get("filenames")
+            return await self._get_files(pass_id, filenames)
         if cmd == "start_pass_archive":
             pass_id = command.get("pass_id")
             machine = command.get("machine")
-            return self._start_pass_archive(pass_id, machine)
+            return await self._start_pass_archive(pass_id, machine)
         if cmd == "get_pass_archive_chunk":
             session = command.get("session")
             offset = command.get("offset", 0)
             chunk_size = command.get("chunk_size", 4 * 1024 * 1024)
-            return self._get_pass_archive_chunk(session, offset, chunk_size)
+            return await self._get_pass_archive_chunk(session, offset, chunk_size)
         if cmd == "finish_pass_archive":
             session = command.get("session")
             return self._finish_pass_archive(session)
@@ -112,161 +219,380 @@ class WebApp(Generic, EasyResource):
             return self._get_base_dir()
         raise ValueError(f"Unknown command: {cmd}")
 
-    def _extract_timestamp(self, pass_id: str) -> str:
-        match = re.search(r"(\d{4})(\d{2})(\d{2})-(\d{2})(\d{2})(\d{2})", pass_id)
-        if match:
-            y, m, d, h, minute, second = match.groups()
-            return f"{y}-{m}-{d} {h}:{minute}:{second}"
-
-        match = re.search(r"(\d{4})-(\d{2})-(\d{2})-(\d{2})-(\d{2})-(\d{2})", pass_id)
-        if match:
-            y, m, d, h, minute, second = match.groups()
-            return f"{y}-{m}-{d} {h}:{minute}:{second}"
-
-        match = re.search(r"(\d{10})", pass_id)
-        if match:
-            try:
-                timestamp = int(match.group(1))
-                return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                pass
-
-        return "Unknown"
-
-    def _list_passes(self) -> Mapping[str, Any]:
+    def _list_passes(self, since: str | None = None) -> Mapping[str, Any]:
         passes: dict[str, Any] = {}
-        if not self.base_dir.exists():
-            return {"passes": passes}
+        modified_cache: dict[int, str] = {}
+        # A missing base_dir lists as empty but still goes through the
+        # versioning below, so every reply carries a "version".
+        try:
+            with os.scandir(self.base_dir) as it:
+                pass_dirs = [entry for entry in it if entry.is_dir()]
+        except FileNotFoundError:
+            pass_dirs = []
 
-        for pass_dir in self.base_dir.iterdir():
-            if not pass_dir.is_dir():
+        for pass_dir in pass_dirs:
+            pass_id = pass_dir.name
+            stat = pass_dir.stat()
+            cached = self._list_cache.get(pass_id)
+            if cached is not None and cached[0] == stat.st_mtime_ns:
+                passes[pass_id] = cached[1]
                 continue
 
-            pass_id = pass_dir.name
-            timestamp = self._extract_timestamp(pass_id)
+            timestamp = _extract_timestamp(pass_id)
             if timestamp == "Unknown":
-                stat = pass_dir.stat()
                 timestamp = datetime.fromtimestamp(stat.st_ctime).strftime(
                     "%Y-%m-%d %H:%M:%S"
                 )
 
-            is_complete = (pass_dir / ".complete").exists()
+            is_complete = os.path.exists(os.path.join(pass_dir.path, ".complete"))
 
-            passes[pass_id] = {
+            info = {
                 "complete": is_complete,
                 "timestamp": timestamp,
-                "entries": [
-                    self._describe_entry(child, pass_dir)
-                    for child in sorted(pass_dir.iterdir(), key=lambda p: p.name.lower())
-                    if not child.name.startswith(".")
-                ],
+                "entries": self._describe_tree(pass_dir.path, modified_cache),
             }
+            passes[pass_id] = info
+            # Completed passes are no longer written to, so their listing only
+            # needs rebuilding if entries are added or removed afterwards.
+            if is_complete:
+                self._list_cache[pass_id] = (stat.st_mtime_ns, info)
+            else:
+                self._list_cache.pop(pass_id, None)
+
+        for stale in self._list_cache.keys() - passes.keys():
+            del self._list_cache[stale]
+        for gone in [p for p in self._archive_cache if not p.is_dir()]:
+            self._release_archive(self._archive_cache.pop(gone)[0])
+
+        logger.debug("Listed %d passes", len(passes))
+        # Cached passes compare by identity, so this is cheap next to
+        # serialising and shipping the whole tree to a polling client.
+        if passes != self._listing:
+            self._listing = passes
+            self._listing_version = uuid4().hex
+        if since is not None and since == self._listing_version:
+            return {"version": self._listing_version, "unchanged": True}
+        return {"passes": passes, "version": self._listing_version}
+
+    def _describe_tree(
+        self, root: str | os.PathLike[str], modified_cache: dict[int, str]
+    ) -> list[Mapping[str, Any]]:
+        """Describe every visible entry below ``root`` as a nested tree."""
+        entries: list[Mapping[str, Any]] = []
+        stack: list[tuple[str | os.PathLike[str], str, list[Mapping[str, Any]]]] = [
+            (root, "", entries)
+        ]
+        while stack:
+            path, prefix, siblings = stack.pop()
+            with os.scandir(path) as it:
+                children = sorted(
+                    (entry for entry in it if not entry.name.startswith(".")),
+                    key=lambda entry: entry.name.lower(),
+                )
 
-        logger.info("Listed %d passes", len(passes))
-        return {"passes": passes}
-
-    def _describe_entry(self, path: Path, root: Path) -> Mapping[str, Any]:
-        stat = path.stat()
-        modified = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-        relative_path = path.relative_to(root).as_posix()
-        if path.is_dir():
-            return {
-                "name": path.name,
-                "kind": "directory",
-                "modified": modified,
-                "path": relative_path,
-                "children": [
-                    self._describe_entry(child, root)
-                    for child in sorted(path.iterdir(), key=lambda p: p.name.lower())
-                    if not child.name.startswith(".")
-                ],
-            }
+            for entry in children:
+                stat = entry.stat()
+                mtime = int(stat.st_mtime)
+                modified = modified_cache.get(mtime)
+                if modified is None:
+                    modified = modified_cache[mtime] = datetime.fromtimestamp(
+                        mtime
+                    ).strftime("%Y-%m-%d %H:%M:%S")
+                relative_path = f"{prefix}{entry.name}"
+                if entry.is_dir():
+                    nested: list[Mapping[str, Any]] = []
+                    siblings.append(
+                        {
+                            "name": entry.name,
+                            "kind": "directory",
+                            "modified": modified,
+                            "path": relative_path,
+                            "children": nested,
+                        }
+                    )
+                    stack.append((entry.path, f"{relative_path}/", nested))
+                    continue
+
+                siblings.append(
+                    {
+                        "name": entry.name,
+                        "kind": "file",
+                        "modified": modified,
+                        "path": relative_path,
+                        "size": stat.st_size,
+                    }
+                )
 
-        return {
-            "name": path.name,
-            "kind": "file",
-            "modified": modified,
-            "path": relative_path,
-            "size": stat.st_size,
-        }
+        return entries
 
     def _get_file(self, pass_id: str | None, filename: str | None) -> Mapping[str, Any]:
+        file_path = self._resolve_file(pass_id, filename)
+        return self._read_file(pass_id, filename, file_path)
+
+    def _resolve_file(self, pass_id: str | None, filename: str | None) -> str:
         if not pass_id or not filename:
             raise ValueError("pass_id and filename required")
 
-        file_path = (self.base_dir / pass_id / filename).resolve()
-        try:
-            file_path.relative_to(self.base_dir)
-        except ValueError as exc:
-            raise ValueError("Invalid path") from exc
+        file_path = self._safe_join(pass_id, filename)
+        if file_path is None:
+            raise ValueError("Invalid path")
 
-        if not file_path.exists() or not file_path.is_file():
+        if not os.path.isfile(file_path):
             raise ValueError(f"File not found: {pass_id}/{filename}")
+        return file_path
 
-        data = file_path.read_bytes()
-        encoded = base64.b64encode(data).decode("utf-8")
+    def _read_file(
+        self, pass_id: str, filename: str, file_path: str
+    ) -> Mapping[str, Any]:
+        with open(file_path, "rb") as fh:
+            data = fh.read()
         logger.info("Serving file %s/%s (%d bytes)", pass_id, filename, len(data))
+        if len(data) <= self._TEXT_MAX_BYTES:
+            # Small UTF-8 files (JSON, YAML, logs) go out as-is, skipping base64.
+            try:
+                text = data.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
+            else:
+                return {"filename": filename, "text": text, "size": len(data)}
+
+        encoded = _base64.b64encode(data).decode("ascii")
         return {"filename": filename, "data": encoded, "size": len(data)}
 
-    def _start_pass_archive(
+    async def _get_files(
+        self, pass_id: str | None, filenames: Any
+    ) -> Mapping[str, Any]:
+        """Serve several files of one pass in a single round-trip."""
+        if (
+            not pass_id
+            or not isinstance(filenames, (list, tuple))
+            or not filenames
+            or not all(isinstance(filename, str) for filename in filenames)
+        ):
+            raise ValueError("pass_id and a list of filenames required")
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._read_files, pass_id, filenames
+        )
+
+    def _read_files(self, pass_id: str, filenames: Sequence[str]) -> Mapping[str, Any]:
+        file_paths = [self._resolve_file(pass_id, filename) for filename in filenames]
+        total = sum(os.path.getsize(file_path) for file_path in file_paths)
+        if total > self._FILES_MAX_BYTES:
+            raise ValueError(
+                f"Requested files total {total} bytes; get_files serves at most "
+                f"{self._FILES_MAX_BYTES}"
+            )
+        return {
+            "files": [
+                self._read_file(pass_id, filename, file_path)
+                for filename, file_path in zip(filenames, file_paths)
+            ]
+        }
+
+    async def _start_pass_archive(
         self, pass_id: str | None, machine: str | None
     ) -> Mapping[str, Any]:
         if not pass_id:
             raise ValueError("pass_id required")
 
-        pass_dir = (self.base_dir / pass_id).resolve()
-        try:
-            pass_dir.relative_to(self.base_dir)
-        except ValueError as exc:
-            raise ValueError("Invalid pass_id") from exc
+        pass_path = self._safe_join(pass_id)
+        if pass_path is None:
+            raise ValueError("Invalid pass_id")
 
-        if not pass_dir.exists() or not pass_dir.is_dir():
+        if not os.path.isdir(pass_path):
             raise ValueError(f"Pass not found: {pass_id}")
+        pass_dir = Path(pass_path)
 
         session_id = uuid4().hex
         safe_pass = self._safe_component(pass_id)
         safe_machine = self._safe_component(machine or "machine")
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
         filename = f"{safe_pass}_{safe_machine}_{timestamp}.zip"
+        archive_path, size = await self._archive_for_pass(pass_dir)
+        try:
+            fd = os.open(archive_path, os.O_RDONLY)
+        except OSError:
+            self._release_archive(archive_path)
+            raise
+        if hasattr(os, "posix_fadvise"):  # Linux only
+            with contextlib.suppress(OSError):
+                os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+        self._archive_sessions[session_id] = {
+            "path": archive_path,
+            "fd": fd,
+            "size": size,
+            "filename": filename,
+            "pass_id": pass_id,
+            "timestamp": timestamp,
+            "machine": machine,
+            "last_access": time.monotonic(),
+        }
+        while len(self._archive_sessions) > self._MAX_SESSIONS:
+            oldest = next(iter(self._archive_sessions))
+            logger.warning("Too many archive sessions; closing %s", oldest)
+            self._finish_pass_archive(oldest)
+        if self._session_reaper is None or self._session_reaper.done():
+            self._session_reaper = asyncio.create_task(self._reap_sessions())
+        logger.info(
+            "Prepared archive for pass %s (%d bytes) session=%s",
+            pass_id,
+            size,
+            session_id,
+        )
+        return {
+            "session": session_id,
+            "filename": filename,
+            "size": size,
+            "timestamp": timestamp,
+            "machine": machine,
+            "suggested_chunk_size": self._suggest_chunk_size(size),
+        }
+
+    @staticmethod
+    def _suggest_chunk_size(size: int) -> int:
+        # Small archives are split into ~4 chunks so progress stays visible;
+        # everything else uses 4 MiB, which balances per-call overhead
+        # against latency per chunk.
+        return max(256 * 1024, min(4 * 1024 * 1024, size // 4))
+
+    async def _archive_for_pass(self, pass_dir: Path) -> tuple[Path, int]:
+        """Return ``(archive_path, size)`` for a ZIP of ``pass_dir``."""
+        # Completed passes are assumed immutable. The directory mtime only
+        # catches entries added or removed at the top level of the pass, not
+        # changes in subdirectories or files rewritten in place.
+        try:
+            stamp: tuple[int, int] | None = (
+                pass_dir.stat().st_mtime_ns,
+                (pass_dir / ".complete").stat().st_mtime_ns,
+            )
+        except FileNotFoundError:
+            stamp = None
+
+        cached = self._archive_cache.get(pass_dir)
+        if cached is not None:
+            cached_path, cached_size, cached_stamp = cached
+            if cached_stamp == stamp and cached_path.exists():
+                self._archive_cache.move_to_end(pass_dir)
+                return cached_path, cached_size
+            del self._archive_cache[pass_dir]
+            self._release_archive(cached_path)
+
         with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp_file:
             archive_path = Path(tmp_file.name)
 
         try:
-            with ZipFile(archive_path, "w", ZIP_DEFLATED) as zip_file:
-                for item in pass_dir.rglob("*"):
-                    if item.is_dir():
-                        continue
-                    rel_path = item.relative_to(pass_dir).as_posix()
-                    zip_file.write(item, rel_path)
-
-            size = archive_path.stat().st_size
-            self._archive_sessions[session_id] = {
-                "path": archive_path,
-                "size": size,
-                "filename": filename,
-                "pass_id": pass_id,
-                "timestamp": timestamp,
-                "machine": machine,
-            }
-            logger.info(
-                "Prepared archive for pass %s (%d bytes) session=%s",
-                pass_id,
-                size,
-                session_id,
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._build_archive, pass_dir, archive_path
             )
-            return {
-                "session": session_id,
-                "filename": filename,
-                "size": size,
-                "timestamp": timestamp,
-                "machine": machine,
-            }
-        except Exception:
+            size = archive_path.stat().st_size
+            if self._closed:
+                raise ValueError("Service is closed")
+        except BaseException:
+            # Includes cancellation: the build thread may still be writing,
+            # but nothing else will ever reference this file.
             with contextlib.suppress(OSError):
                 archive_path.unlink(missing_ok=True)
             raise
 
-    def _get_pass_archive_chunk(
+        if stamp is not None and size <= self._ARCHIVE_CACHE_MAX_BYTES:
+            # A concurrent build of the same pass may have finished first.
+            previous = self._archive_cache.pop(pass_dir, None)
+            self._archive_cache[pass_dir] = (archive_path, size, stamp)
+            if previous is not None:
+                self._release_archive(previous[0])
+            total = sum(cached[1] for cached in self._archive_cache.values())
+            while total > self._ARCHIVE_CACHE_MAX_BYTES:
+                _, (evicted_path, evicted_size, _) = self._archive_cache.popitem(
+                    last=False
+                )
+                total -= evicted_size
+                self._release_archive(evicted_path)
+        return archive_path, size
+
+    def _release_archive(self, archive_path: Path) -> None:
+        """Delete ``archive_path`` once no cache entry or session refers to it."""
+        if any(cached[0] == archive_path for cached in self._archive_cache.values()):
+            return
+        if any(s["path"] == archive_path for s in self._archive_sessions.values()):
+            return
+        with contextlib.suppress(OSError):
+            archive_path.unlink(missing_ok=True)
+
+    def _build_archive(self, pass_dir: Path, archive_path: Path) -> None:
+        """Write every file under ``pass_dir`` into a ZIP at ``archive_path``."""
+        window = self._COMPRESS_WORKERS * 2
+        pending: deque[Future[tuple[ZipInfo, bytes]]] = deque()
+        with ZipFile(archive_path, "w", ZIP_DEFLATED) as zip_file, ThreadPoolExecutor(
+            max_workers=self._COMPRESS_WORKERS
+        ) as pool:
+            root = str(pass_dir)
+            for item, rel_path in self._walk_files(root):
+                if os.path.islink(item) and not self._is_contained(item):
+                    logger.warning("Skipping %s: links outside base_dir", item)
+                    continue
+                compress_type = (
+                    ZIP_STORED
+                    if os.path.splitext(item)[1].lower() in self._STORED_SUFFIXES
+                    else ZIP_DEFLATED
+                )
+                if os.path.getsize(item) > self._PARALLEL_MAX_BYTES:
+                    while pending:
+                        self._append_compressed(zip_file, *pending.popleft().result())
+                    zip_file.write(item, rel_path, compress_type=compress_type)
+                    continue
+
+                pending.append(
+                    pool.submit(self._compress_member, item, rel_path, compress_type)
+                )
+                if len(pending) >= window:
+                    self._append_compressed(zip_file, *pending.popleft().result())
+
+            while pending:
+                self._append_compressed(zip_file, *pending.popleft().result())
+
+    @staticmethod
+    def _walk_files(root: str) -> Iterator[tuple[str, str]]:
+        """Yield ``(path, archive_name)`` for every file below ``root``."""
+        prefix_len = len(os.path.join(root, ""))
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                yield full, full[prefix_len:].replace(os.sep, "/")
+
+    @staticmethod
+    def _compress_member(
+        path: str, arcname: str, compress_type: int
+    ) -> tuple[ZipInfo, bytes]:
+        info = ZipInfo.from_file(path, arcname)
+        with open(path, "rb") as fh:
+            data = fh.read()
+        info.compress_type = compress_type
+        info.file_size = len(data)
+        info.CRC = zlib.crc32(data)
+        if compress_type == ZIP_DEFLATED:
+            # Raw DEFLATE stream, matching what ZipFile.write produces.
+            compressor = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15
+            )
+            data = compressor.compress(data) + compressor.flush()
+        info.compress_size = len(data)
+        return info, data
+
+    @staticmethod
+    def _append_compressed(zip_file: ZipFile, info: ZipInfo, payload: bytes) -> None:
+        """Append a member whose CRC, sizes and payload were computed up front."""
+        # ZipFile has no public API for pre-compressed members, so this relies
+        # on its private fp, start_dir, filelist and NameToInfo attributes.
+        zip_file.fp.seek(zip_file.start_dir)
+        info.header_offset = zip_file.fp.tell()
+        zip_file.fp.write(info.FileHeader(False))
+        zip_file.fp.write(payload)
+        zip_file.start_dir = zip_file.fp.tell()
+        zip_file.filelist.append(info)
+        zip_file.NameToInfo[info.filename] = info
+
+    async def _get_pass_archive_chunk(
         self, session_id: str | None, offset: Any, chunk_size: Any
     ) -> Mapping[str, Any]:
         if not session_id:
@@ -274,13 +600,15 @@ class WebApp(Generic, EasyResource):
         session = self._archive_sessions.get(session_id)
         if session is None:
             raise ValueError("Unknown session")
+        session["last_access"] = time.monotonic()
+        self._archive_sessions.move_to_end(session_id)
 
         total_size = int(session["size"])
         start = int(offset or 0)
         if start < 0:
             raise ValueError("offset must be >= 0")
 
-        max_chunk = 8 * 1024 * 1024
+        max_chunk = 16 * 1024 * 1024
         default_chunk = 4 * 1024 * 1024
         try:
             requested = int(chunk_size)
@@ -291,7 +619,6 @@ class WebApp(Generic, EasyResource):
             requested = default_chunk
         chunk_len = min(requested, max_chunk)
 
-        archive_path: Path = session["path"]
         if start >= total_size:
             return {
                 "data": "",
@@ -301,12 +628,15 @@ class WebApp(Generic, EasyResource):
                 "size": total_size,
             }
 
-        with archive_path.open("rb") as fh:
-            fh.seek(start)
-            data = fh.read(chunk_len)
+        # The read gets its own descriptor, so finishing the session mid-read
+        # cannot hand it a reused fd number.
+        fd = os.dup(session["fd"])
+        data = await asyncio.get_running_loop().run_in_executor(
+            None, self._read_chunk, fd, chunk_len, start
+        )
 
         bytes_read = len(data)
-        encoded = base64.b64encode(data).decode("utf-8")
+        encoded = _base64.b64encode(data).decode("ascii")
         next_offset = start + bytes_read
         done = next_offset >= total_size
 
@@ -318,6 +648,14 @@ class WebApp(Generic, EasyResource):
             "size": total_size,
         }
 
+    @staticmethod
+    def _read_chunk(fd: int, length: int, offset: int) -> bytes:
+        """Read ``length`` bytes from ``offset``, then close ``fd``."""
+        try:
+            return os.pread(fd, length, offset)
+        finally:
+            os.close(fd)
+
     def _finish_pass_archive(self, session_id: str | None) -> Mapping[str, Any]:
         if not session_id:
             raise ValueError("session required")
@@ -326,14 +664,39 @@ class WebApp(Generic, EasyResource):
         if session is None:
             raise ValueError("Unknown session")
 
-        archive_path: Path = session["path"]
         with contextlib.suppress(OSError):
-            archive_path.unlink(missing_ok=True)
+            os.close(session["fd"])
+        self._release_archive(session["path"])
         logger.info(
             "Cleaned archive session %s for pass %s", session_id, session["pass_id"]
         )
         return {"status": "ok"}
 
+    async def _reap_sessions(self) -> None:
+        """Close archive sessions idle for longer than ``_SESSION_TTL``."""
+        while self._archive_sessions:
+            await asyncio.sleep(self._SESSION_REAP_INTERVAL)
+            cutoff = time.monotonic() - self._SESSION_TTL
+            expired = [
+                session_id
+                for session_id, session in self._archive_sessions.items()
+                if session["last_access"] < cutoff
+            ]
+            for session_id in expired:
+                logger.info("Archive session %s expired", session_id)
+                self._finish_pass_archive(session_id)
+
+    def _safe_join(self, *parts: str) -> str | None:
+        """Join ``parts`` onto base_dir, or return None if that escapes it."""
+        path = os.path.normpath(os.path.join(self._base_prefix, *parts))
+        if not path.startswith(self._base_prefix) or not self._is_contained(path):
+            return None
+        return path
+
+    def _is_contained(self, path: str) -> bool:
+        # Symlinks inside a pass may still point outside base_dir.
+        return os.path.realpath(path).startswith(self._base_prefix)
+
     @staticmethod
     def _safe_component(value: str) -> str:
         return re.sub(r"[^A-Za-z0-9._-]", "_", value)
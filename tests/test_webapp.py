@@ -0,0 +1,97 @@
+import asyncio
+import os
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+
+pytest.importorskip("viam")
+
+from opencv_webapp.webapp import WebApp  # noqa: E402
+
+
+@pytest.fixture
+def webapp(tmp_path):
+    return WebApp("test", str(tmp_path / "passes"))
+
+
+def test_build_archive_mixes_stored_deflated_and_streamed_members(
+    webapp, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(WebApp, "_PARALLEL_MAX_BYTES", 64 * 1024)
+    pass_dir = webapp.base_dir / "pass-20240101-120000"
+    (pass_dir / "sub").mkdir(parents=True)
+    contents = {
+        "board.png": os.urandom(32 * 1024),
+        "intrinsics.json": b'{"fx": 1.0}' * 100,
+        "sub/frames.bin": b"frame" * 40 * 1024,
+        "empty.txt": b"",
+    }
+    for name, data in contents.items():
+        (pass_dir / name).write_bytes(data)
+
+    archive_path = tmp_path / "pass.zip"
+    webapp._build_archive(pass_dir, archive_path)
+
+    with ZipFile(archive_path) as zip_file:
+        assert zip_file.testzip() is None
+        infos = {info.filename: info for info in zip_file.infolist()}
+        assert set(infos) == set(contents)
+        assert infos["board.png"].compress_type == ZIP_STORED
+        assert infos["intrinsics.json"].compress_type == ZIP_DEFLATED
+        assert infos["sub/frames.bin"].compress_type == ZIP_DEFLATED
+        for name, data in contents.items():
+            assert zip_file.read(name) == data
+
+
+@pytest.fixture
+def pass_with_escape(webapp, tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.txt").write_text("secret")
+    pass_dir = webapp.base_dir / "pass-1"
+    pass_dir.mkdir()
+    (pass_dir / "ok.txt").write_text("ok")
+    (pass_dir / "leak.txt").symlink_to(outside / "secret.txt")
+    (webapp.base_dir / "pass-link").symlink_to(outside, target_is_directory=True)
+    return pass_dir
+
+
+@pytest.mark.parametrize(
+    "pass_id, filename",
+    [
+        ("pass-1", "../../outside/secret.txt"),
+        ("../outside", "secret.txt"),
+        ("pass-1", "/etc/passwd"),
+        ("/etc", "passwd"),
+        ("pass-1", "leak.txt"),
+        ("pass-link", "secret.txt"),
+    ],
+)
+def test_get_file_rejects_paths_outside_base_dir(
+    webapp, pass_with_escape, pass_id, filename
+):
+    with pytest.raises(ValueError, match="Invalid path"):
+        webapp._get_file(pass_id, filename)
+
+
+def test_get_file_serves_paths_inside_base_dir(webapp, pass_with_escape):
+    assert webapp._get_file("pass-1", "ok.txt")["text"] == "ok"
+    assert webapp._get_file("pass-1", "sub/../ok.txt")["text"] == "ok"
+
+
+@pytest.mark.parametrize(
+    "pass_id", [".", "pass-1/..", "..", "../outside", "/etc", "pass-link"]
+)
+def test_start_pass_archive_rejects_paths_outside_base_dir(
+    webapp, pass_with_escape, pass_id
+):
+    with pytest.raises(ValueError, match="Invalid pass_id"):
+        asyncio.run(webapp._start_pass_archive(pass_id, None))
+
+
+def test_archive_skips_symlinks_outside_base_dir(webapp, pass_with_escape, tmp_path):
+    archive_path = tmp_path / "pass.zip"
+    webapp._build_archive(pass_with_escape, archive_path)
+
+    with ZipFile(archive_path) as zip_file:
+        assert zip_file.namelist() == ["ok.txt"]